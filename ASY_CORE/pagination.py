@@ -1,7 +1,54 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that caches the total row count for a short time.
+
+    The count is keyed on the compiled SQL and parameters of the queryset, so
+    every distinct filter/search combination gets its own entry, and repeated
+    page requests skip the SELECT COUNT(*) until the entry expires. Subclasses
+    may return a token from get_count_cache_version() that changes on writes.
+
+    The project configures no shared CACHES backend, so each process has its
+    own LocMemCache: a version bump only reaches the process that made the
+    write, and other processes may serve a count up to count_cache_timeout
+    seconds old.
+    """
+    count_cache_timeout = 30
+
+    def get_count_cache_version(self):
+        return ''
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return super().count
+        try:
+            # str(query) interpolates params unquoted, so distinct queries
+            # could render the same; hash the SQL and params separately
+            sql_with_params = query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        cache_key = 'paginator_count:%s:%s' % (
+            self.get_count_cache_version(),
+            hashlib.md5(repr(sql_with_params).encode()).hexdigest(),
+        )
+        count = cache.get(cache_key)
+        if count is None:
+            count = super().count
+            cache.set(cache_key, count, self.count_cache_timeout)
+        return count
+
+
 class StandardResultsSetPagination(PageNumberPagination):
     """
     Custom pagination class that standardizes response format across the project.
@@ -24,3 +71,28 @@ class StandardResultsSetPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+class StandardCursorPagination(CursorPagination):
+    """
+    Keyset pagination for large, time-ordered tables.
+
+    Each page filters on the position of the first ordering field
+    (created_at) instead of LIMIT/OFFSET from the start, so deep pages can use
+    the created_at index; ties on created_at are stepped over with a small
+    offset, and id only fixes the order within a page. Returns the standard
+    response format; count is always null since computing it would
+    reintroduce the full scan this class avoids.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': None,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
@@ -205,9 +205,17 @@ REST_FRAMEWORK = {
         'anon': '100/day',
         'user': '1000/day',
         'burst': '50/minute',
+        'attachment_upload': config('ATTACHMENT_UPLOAD_RATE', default='30/min'),
     },
 }
 
+# Maximum number of attachment uploads processed concurrently per worker process
+MAX_UPLOAD_CONCURRENCY = config('MAX_UPLOAD_CONCURRENCY', default=8, cast=int)
+
+# Background threads per process for stamping signatures; 0 signs inline
+# before the signature create request returns
+SIGNATURE_WORKERS = config('SIGNATURE_WORKERS', default=0, cast=int)
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = config('CORS_ALLOW_ALL_ORIGINS', default=True, cast=bool)
 CORS_ALLOW_CREDENTIALS = config('CORS_ALLOW_CREDENTIALS', default=True, cast=bool)
@@ -8,6 +8,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from django.views.generic import RedirectView
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -32,6 +33,24 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+# API Documentation: live introspection in development only. Production
+# publishes the spec through the static files pipeline, generated at deploy
+# time with `python manage.py generate_swagger -o static/schema.json` before
+# collectstatic, so whatever serves STATIC_URL (web server/CDN) caches it
+if settings.DEBUG:
+    api_docs_urlpatterns = [
+        path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+        path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    ]
+else:
+    api_docs_urlpatterns = [
+        path(
+            'api/schema.json',
+            RedirectView.as_view(url=settings.STATIC_URL + 'schema.json'),
+            name='schema-json',
+        ),
+    ]
+
 urlpatterns = [
     # Admin site
     path('admin/', admin.site.urls),
@@ -40,9 +59,8 @@ urlpatterns = [
     path('api/token/refresh', TokenRefreshView.as_view(), name='token_refresh'),
     
     # API Documentation
-    path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-    
+    *api_docs_urlpatterns,
+
     # API endpoints - organized by app name for better Swagger grouping
     # Users app endpoints
     path('api/', include('users.api.urls')),
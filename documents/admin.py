@@ -23,6 +23,9 @@ class DocumentAdmin(admin.ModelAdmin):
     ]
     search_fields = ["title", "description"]
     readonly_fields = ["created_at", "updated_at"]
+    ordering = ["-created_at"]
+    list_select_related = ["department", "priority"]
+    autocomplete_fields = ["department", "priority", "uploaded_by", "reviewed_by"]
 
 
 @admin.register(DocumentAttachment)
@@ -32,6 +35,8 @@ class DocumentAttachmentAdmin(admin.ModelAdmin):
         "original_name",
         "created_at",
     ]
+    ordering = ["-created_at"]
+    list_select_related = ["document"]
 
 
 @admin.register(Signature)
@@ -45,3 +50,15 @@ class SignatureAdmin(admin.ModelAdmin):
         "department_data",
         "signed_at",
     ]
+    ordering = ["-signed_at"]
+    list_select_related = ["attachment", "attachment__document", "signed_by"]
+
+    def get_queryset(self, request):
+        # The base64 signature image is never shown in the list; load it lazily
+        return super().get_queryset(request).defer("signature_data")
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # DocumentAttachment.__str__ reads the document title for every option
+        if db_field.name == "attachment":
+            kwargs["queryset"] = DocumentAttachment.objects.select_related("document")
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
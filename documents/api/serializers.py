@@ -1,20 +1,62 @@
-from datetime import datetime
+import itertools
+import time
 from pathlib import Path
+from django.utils.functional import cached_property
 from rest_framework import serializers
-from django.core.files.base import ContentFile
 from documents.models import Document, DocumentAttachment, Signature
 from users.models import User
 from lookups.models import DefaultSignature
 
 
-class SignedBySerializer(serializers.ModelSerializer):
+# Per-process counter appended to upload names so concurrent uploads never collide
+_upload_name_counter = itertools.count()
+
+# Upload rules per Document.file_type: (label, allowed extensions, allowed MIME types)
+UPLOAD_RULES = {
+    'pdf': ('PDF', frozenset({'.pdf'}), frozenset({'application/pdf'})),
+    'images': (
+        'image',
+        frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff', '.svg'}),
+        frozenset({
+            'image/jpeg', 'image/jpg', 'image/png', 'image/gif',
+            'image/bmp', 'image/webp', 'image/tiff', 'image/svg+xml',
+        }),
+    ),
+}
+
+
+class CachedReadableFieldsMixin:
+    """
+    Build the readable fields tuple once per serializer instance.
+
+    With many=True DRF reuses a single child serializer for every row, so the
+    default generator would re-filter the field dict for each object rendered.
+    """
+
+    @cached_property
+    def _readable_fields(self):
+        return tuple(field for field in self.fields.values() if not field.write_only)
+
+
+class SignedBySerializer(CachedReadableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "first_name", "last_name", "email", "role"]
         read_only_fields = ["id", "role"]
 
+    def to_representation(self, instance):
+        # When the caller provides a 'user_representations' dict in the context,
+        # render each user once per request and reuse it for every other row
+        representations = self.context.get('user_representations')
+        if representations is None:
+            return super().to_representation(instance)
+        data = representations.get(instance.pk)
+        if data is None:
+            data = representations[instance.pk] = super().to_representation(instance)
+        return data
+
 
-class DocumentAttachmentSerializer(serializers.ModelSerializer):
+class DocumentAttachmentSerializer(CachedReadableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = DocumentAttachment
         fields = "__all__"
@@ -34,10 +76,11 @@ class DocumentSerializer(serializers.ModelSerializer):
     uploaded_by = SignedBySerializer(read_only=True)
     reviewed_by = SignedBySerializer(read_only=True)
     attachments = DocumentAttachmentSerializer(many=True, read_only=True)
-    priority_ar = serializers.CharField(source='priority.name_ar', read_only=True)
-    priority_en = serializers.CharField(source='priority.name_en', read_only=True)
-    department_ar = serializers.CharField(source='department.name_ar', read_only=True)
-    department_en = serializers.CharField(source='department.name_en', read_only=True)
+    # Annotated onto the queryset by DocumentViewSet.get_queryset
+    priority_ar = serializers.CharField(read_only=True)
+    priority_en = serializers.CharField(read_only=True)
+    department_ar = serializers.CharField(read_only=True)
+    department_en = serializers.CharField(read_only=True)
 
     class Meta:
         model = Document
@@ -45,11 +88,12 @@ class DocumentSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at", "uploaded_by"]
 
 
-class ListDocumentSerializer(serializers.ModelSerializer):
-    priority_ar = serializers.CharField(source='priority.name_ar', read_only=True)
-    priority_en = serializers.CharField(source='priority.name_en', read_only=True)
-    department_ar = serializers.CharField(source='department.name_ar', read_only=True)
-    department_en = serializers.CharField(source='department.name_en', read_only=True)
+class ListDocumentSerializer(CachedReadableFieldsMixin, serializers.ModelSerializer):
+    # Annotated onto the queryset by DocumentViewSet.get_queryset
+    priority_ar = serializers.CharField(read_only=True)
+    priority_en = serializers.CharField(read_only=True)
+    department_ar = serializers.CharField(read_only=True)
+    department_en = serializers.CharField(read_only=True)
     
     class Meta:
         model = Document
@@ -103,80 +147,44 @@ class DocumentAttachmentCreateSerializer(serializers.ModelSerializer):
         file_obj = data.get('file')
 
         if document and file_obj:
-            file_name = file_obj.name.lower()
-            file_type = document.file_type
-
-            # Get file extension
-            file_extension = Path(file_name).suffix.lower()
-
-            # Validate PDF files
-            if file_type == 'pdf':
-                allowed_extensions = ['.pdf']
-                allowed_mime_types = ['application/pdf']
-                
-                # Check file extension
-                if file_extension not in allowed_extensions:
-                    raise serializers.ValidationError(
-                        f"Invalid file type. Only PDF files are allowed for this document type. "
-                        f"Received file with extension: {file_extension}"
-                    )
-                
-                # Additional validation: Check MIME type if available
-                if hasattr(file_obj, 'content_type') and file_obj.content_type:
-                    if file_obj.content_type not in allowed_mime_types:
-                        raise serializers.ValidationError(
-                            f"File MIME type '{file_obj.content_type}' does not match PDF format. "
-                            f"Please upload a valid PDF file."
-                        )
-            
-            # Validate Image files
-            elif file_type == 'images':
-                allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff', '.svg']
-                allowed_mime_types = [
-                    'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 
-                    'image/bmp', 'image/webp', 'image/tiff', 'image/svg+xml'
-                ]
-                
-                # Check file extension
-                if file_extension not in allowed_extensions:
-                    raise serializers.ValidationError(
-                        f"Invalid file type. Only image files are allowed for this document type. "
-                        f"Supported formats: {', '.join(allowed_extensions)}. "
-                        f"Received file with extension: {file_extension}"
-                    )
-                
-                # Additional validation: Check MIME type if available
-                if hasattr(file_obj, 'content_type') and file_obj.content_type:
-                    if file_obj.content_type not in allowed_mime_types:
-                        raise serializers.ValidationError(
-                            f"File MIME type '{file_obj.content_type}' does not match image format. "
-                            f"Please upload a valid image file."
-                        )
+            rules = UPLOAD_RULES.get(document.file_type)
+            if rules is None:
+                return data
+            label, allowed_extensions, allowed_mime_types = rules
+            file_extension = Path(file_obj.name).suffix.lower()
+
+            # Check file extension
+            if file_extension not in allowed_extensions:
+                raise serializers.ValidationError(
+                    f"Invalid file type. Only {label} files are allowed for this document type. "
+                    f"Supported formats: {', '.join(sorted(allowed_extensions))}. "
+                    f"Received file with extension: {file_extension}"
+                )
+
+            # Additional validation: Check MIME type if available
+            content_type = getattr(file_obj, 'content_type', None)
+            if content_type and content_type not in allowed_mime_types:
+                raise serializers.ValidationError(
+                    f"File MIME type '{content_type}' does not match {label} format. "
+                    f"Please upload a valid {label} file."
+                )
 
         return data
 
     def create(self, validated_data):
         """
-        Create a DocumentAttachment with renamed file using integer timestamp.
+        Create a DocumentAttachment with renamed file using a nanosecond timestamp.
         This prevents issues with Arabic or special characters in filenames.
         """
         file_obj = validated_data['file']
-        original_name = validated_data.get('original_name', file_obj.name)
-        
+
         # Get file extension from original file
         file_extension = Path(file_obj.name).suffix.lower()
-        
-        # Generate new filename using integer timestamp
-        timestamp = int(datetime.now().timestamp())
-        new_filename = f"{timestamp}{file_extension}"
-        
-        # Read file content and create new ContentFile with renamed filename
-        file_content = file_obj.read()
-        renamed_file = ContentFile(file_content, name=new_filename)
-        
-        # Replace the file in validated_data with the renamed file
-        validated_data['file'] = renamed_file
-        
+
+        # Rename the upload in place; the storage backend streams it to disk in
+        # chunks, so the file is never copied into memory here
+        file_obj.name = f"{time.time_ns()}_{next(_upload_name_counter)}{file_extension}"
+
         # Create and return the attachment
         return super().create(validated_data)
 
@@ -199,6 +207,6 @@ class SignatureCreateSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         if data.get("is_approved"):
-            data["signature_data"] = DefaultSignature.objects.get(id=1).signature_data
+            data["signature_data"] = DefaultSignature.get_default_signature_data()
         return data
 
@@ -18,6 +18,12 @@ urlpatterns = [
         views.DocumentViewSet.as_view({"get": "list"}),
         name="documents-list",
     ),
+    path(
+        "export",
+        # Routed by hand, so the action's pagination_class has to be passed here
+        views.DocumentViewSet.as_view({"get": "export"}, pagination_class=None),
+        name="documents-export",
+    ),
     path(
         "create",
         views.DocumentViewSet.as_view({"post": "create"}),
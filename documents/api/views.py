@@ -1,12 +1,26 @@
-from django.db.models import Q
+import hashlib
+import operator
+from functools import reduce
+from threading import BoundedSemaphore
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.fields import DateTimeField
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import csrf_exempt
 
-from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.filterset import filterset_factory
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet
 
 from documents.models import Document, DocumentAttachment, Signature
 from .serializers import (
@@ -19,8 +33,32 @@ from .serializers import (
     SignatureCreateSerializer,
     SignatureSerializer,
 )
-from documents.services.sign_document import SignatureAgent
-from ASY_CORE.pagination import StandardResultsSetPagination
+from documents.services.signature_tasks import enqueue_signature
+from ASY_CORE.pagination import (
+    CachedCountPaginator,
+    StandardCursorPagination,
+    StandardResultsSetPagination,
+)
+
+# Bounds the number of uploads held in memory/temp storage at once per process
+_upload_semaphore = BoundedSemaphore(settings.MAX_UPLOAD_CONCURRENCY)
+
+# Image attachments are matched on file suffix; OR-ed iendswith lookups are cheap
+# comparisons where the equivalent iregex runs a regex engine per row
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+IMAGE_FILE_FILTER = reduce(operator.or_, (Q(file__iendswith=ext) for ext in IMAGE_EXTENSIONS))
+
+
+class DocumentCountPaginator(CachedCountPaginator):
+    """Caches document list counts until this process sees a document save/delete."""
+
+    def get_count_cache_version(self):
+        return Document.list_cache_version()
+
+
+class DocumentResultsSetPagination(StandardResultsSetPagination):
+    django_paginator_class = DocumentCountPaginator
+
 
 class DocumentViewSet(viewsets.GenericViewSet):
     """
@@ -29,59 +67,219 @@ class DocumentViewSet(viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'priority', 'department', 'uploaded_by', 'reviewed_by']
+    # Built once here instead of DjangoFilterBackend generating a FilterSet
+    # class from filterset_fields on every request
+    filterset_class = filterset_factory(Document, filterset=FilterSet, fields=filterset_fields)
+    # The backends hold no per-request state, so one instance of each is shared
+    filter_backend_instances = tuple(backend() for backend in filter_backends)
+    # Query params any of the backends react to
+    filter_query_params = frozenset((
+        *filterset_fields,
+        filters.SearchFilter.search_param,
+        filters.OrderingFilter.ordering_param,
+    ))
     search_fields = ['title', 'description', 'comments']
     ordering_fields = ['created_at', 'updated_at', 'priority']
-    ordering = ['-created_at']
-    pagination_class = StandardResultsSetPagination
+    ordering = ['-created_at', '-id']
+    pagination_class = DocumentResultsSetPagination
+    cursor_pagination_class = StandardCursorPagination
+    # Lookup names rendered by the document serializers, annotated onto the
+    # queryset so they are read as plain columns instead of via related objects
+    lookup_name_annotations = {
+        'priority_ar': F('priority__name_ar'),
+        'priority_en': F('priority__name_en'),
+        'department_ar': F('department__name_ar'),
+        'department_en': F('department__name_en'),
+    }
+    # The list endpoint renders ListDocumentSerializer's payload straight from
+    # queryset.values(); keep these in sync with its fields
+    list_values_fields = [
+        'id', 'title', 'description', 'priority', 'status', 'created_at',
+    ]
+    list_values_expressions = lookup_name_annotations
+    created_at_field = DateTimeField(read_only=True)
+    # Seconds a rendered list page is reused for the same user and URL
+    list_cache_timeout = 5
 
     def get_serializer_class(self):
+        return self._action_serializer_class
+
+    @cached_property
+    def _action_serializer_class(self):
+        # The action is fixed for the lifetime of a request, so resolve it once
         if self.action == 'create':
             return DocumentCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return DocumentUpdateSerializer
-        elif self.action == 'list':
+        elif self.action in ['list', 'export']:
             return ListDocumentSerializer
         return DocumentSerializer
+
+    @cached_property
+    def paginator(self):
+        """Paginator for this request; ?pagination=cursor opts into keyset pagination."""
+        if self.pagination_class is None:
+            return None
+        request = getattr(self, 'request', None)
+        if request is not None and request.query_params.get('pagination') == 'cursor':
+            return self.cursor_pagination_class()
+        return self.pagination_class()
     
     def get_queryset(self):
+        return self._action_queryset
+
+    @cached_property
+    def _eager_queryset(self):
+        # Soft-deleted documents are excluded by Document.objects
+        queryset = Document.objects.all()
+
+        # Eager-load the relations the serializers read to avoid N+1 queries
+        if self.action == 'export':
+            queryset = queryset.for_list().annotate(**self.lookup_name_annotations)
+        elif self.action in ['retrieve', 'change_status']:
+            queryset = queryset.with_relations().annotate(**self.lookup_name_annotations)
+        return queryset
+
+    @cached_property
+    def _action_queryset(self):
+        # Built once per request; callers only derive new querysets from it
         user = self.request.user
-        # Exclude soft-deleted documents from all queries
-        queryset = Document.objects.filter(is_deleted=False)
+        queryset = self._eager_queryset
 
         # Filter based on user role
         if user.role == 'ceo':
             # CEO can see all documents (except deleted)
             return queryset
         else:
-            # Helpdesk can see documents they uploaded or are assigned to review
-            return queryset.filter(
-                Q(uploaded_by=user) |
-                Q(reviewed_by=user) |
-                Q(status='pending')
+            # Helpdesk can see documents they uploaded or are assigned to review.
+            # Each branch is its own indexed lookup; a UNION of their ids lets
+            # the planner use those indexes where an OR across three columns
+            # tends to fall back to a scan. The outer queryset stays filterable.
+            active = Document.objects.values('pk')
+            visible_ids = active.filter(uploaded_by=user).union(
+                active.filter(reviewed_by=user),
+                active.filter(status='pending'),
             )
+            return queryset.filter(pk__in=visible_ids)
+
+    def _is_visible(self, document):
+        """Python counterpart of the role filter in _action_queryset."""
+        user = self.request.user
+        return (
+            user.role == 'ceo'
+            or document.uploaded_by_id == user.id
+            or document.reviewed_by_id == user.id
+            or document.status == 'pending'
+        )
+
+    def get_object(self):
+        """
+        Fetch a single document with a primary-key lookup.
+
+        Visibility is checked on the fetched row instead of running the role
+        filter's subqueries for one document.
+        """
+        document = get_object_or_404(self._eager_queryset, pk=self.kwargs['pk'])
+        if not self._is_visible(document):
+            raise Http404('No Document matches the given query.')
+        self.check_object_permissions(self.request, document)
+        return document
     
+    def filter_queryset(self, queryset):
+        # With no filter, search or ordering params the backends would only
+        # apply the default ordering, so skip building the FilterSet form
+        if self.filter_query_params.isdisjoint(self.request.query_params):
+            return queryset.order_by(*self.ordering)
+
+        for backend in self.filter_backend_instances:
+            queryset = backend.filter_queryset(self.request, queryset, self)
+        return queryset
+
     def list(self, request):
-        queryset = self.get_queryset()
-        
+        # Dashboards poll this endpoint; repeat requests for the same page are
+        # served from a short-lived per-user cache. A document change drops it
+        # in this process only (no shared CACHES backend), so other processes
+        # may serve a page up to list_cache_timeout seconds old
+        cache_key = 'doclist:%s:%s:%s' % (
+            Document.list_cache_version(),
+            request.user.id,
+            hashlib.blake2b(request.build_absolute_uri().encode(), digest_size=8).hexdigest(),
+        )
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data)
+
         # Apply filters, search, and ordering
-        for backend in list(self.filter_backends):
-            queryset = backend().filter_queryset(request, queryset, self)
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # Fetch the flat list payload as dicts, skipping model instantiation
+        # and per-field serializer work
+        queryset = queryset.values(*self.list_values_fields, **self.list_values_expressions)
             
         # Pagination
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer_class()(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            response = self.get_paginated_response(self._format_list_rows(page))
+            cache.set(cache_key, response.data, self.list_cache_timeout)
+            return response
             
-        # If pagination is disabled, still return in standard format
-        serializer = self.get_serializer_class()(queryset, many=True)
-        return Response({
-            'count': queryset.count(),
-            'next': None,
-            'previous': None,
-            'results': serializer.data
-        })
+        # If pagination is disabled, still return in standard format, but
+        # stream it so memory stays bounded however many documents match
+        return StreamingHttpResponse(
+            self._stream_list_rows(queryset), content_type='application/json'
+        )
+
+    def _format_list_row(self, row):
+        """Render a values() row the way ListDocumentSerializer would."""
+        # A new dict: the cursor paginator still reads the raw created_at from
+        # the page's rows when it builds the next/previous links
+        return {**row, 'created_at': self.created_at_field.to_representation(row['created_at'])}
+
+    def _format_list_rows(self, rows):
+        """Render values() rows the way ListDocumentSerializer would."""
+        return [self._format_list_row(row) for row in rows]
+
+    def _stream_list_rows(self, rows):
+        """
+        Yield the standard list envelope as JSON chunks.
+
+        Rows are read with a server-side cursor; the count is only known once
+        they have all been written, so it comes after the results.
+        """
+        encoder = JSONEncoder(ensure_ascii=False)
+        yield '{"next": null, "previous": null, "results": ['
+        count = 0
+        for row in rows.iterator(chunk_size=500):
+            if count:
+                yield ','
+            yield encoder.encode(self._format_list_row(row))
+            count += 1
+        yield '], "count": %d}' % count
     
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def export(self, request):
+        """
+        Stream every matching document as a JSON array.
+
+        Rows are read with a server-side cursor and serialized one at a time,
+        so memory stays bounded regardless of how many documents match.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        # One serializer renders every row; get_serializer() here passes no
+        # context, so hand it the request explicitly
+        serializer = self.get_serializer(context=self.get_serializer_context())
+        encoder = JSONEncoder(ensure_ascii=False)
+
+        def stream():
+            yield '['
+            for index, document in enumerate(queryset.iterator(chunk_size=500)):
+                if index:
+                    yield ','
+                yield encoder.encode(serializer.to_representation(document))
+            yield ']'
+
+        return StreamingHttpResponse(stream(), content_type='application/json')
+
     def create(self, request):
         serializer = DocumentCreateSerializer(data=request.data)
         if serializer.is_valid():
@@ -101,8 +299,7 @@ class DocumentViewSet(viewsets.GenericViewSet):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     def retrieve(self, request, pk=None):
-        queryset = self.get_queryset()
-        document = get_object_or_404(queryset, pk=pk)
+        document = self.get_object()
         serializer = DocumentSerializer(document)
         return Response({
             'count': 1,
@@ -112,8 +309,7 @@ class DocumentViewSet(viewsets.GenericViewSet):
         })
     
     def update(self, request, pk=None):
-        queryset = self.get_queryset()
-        document = get_object_or_404(queryset, pk=pk)
+        document = self.get_object()
         serializer = DocumentUpdateSerializer(document, data=request.data)
         if serializer.is_valid():
             serializer.save()
@@ -132,8 +328,7 @@ class DocumentViewSet(viewsets.GenericViewSet):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     def partial_update(self, request, pk=None):
-        queryset = self.get_queryset()
-        document = get_object_or_404(queryset, pk=pk)
+        document = self.get_object()
         serializer = DocumentUpdateSerializer(document, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
@@ -152,12 +347,11 @@ class DocumentViewSet(viewsets.GenericViewSet):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     def destroy(self, request, pk=None):
-        queryset = self.get_queryset()
-        document = get_object_or_404(queryset, pk=pk)
+        document = self.get_object()
         document_id = document.id
         # Soft delete: set is_deleted flag instead of calling delete()
         document.is_deleted = True
-        document.save()
+        document.save(update_fields=['is_deleted', 'updated_at'])
         return Response({
             'count': 0,
             'next': None,
@@ -168,8 +362,7 @@ class DocumentViewSet(viewsets.GenericViewSet):
     
     @action(detail=True, methods=['post'])
     def change_status(self, request, pk=None):
-        queryset = self.get_queryset()
-        document = get_object_or_404(queryset, pk=pk)
+        document = self.get_object()
         new_status = request.data.get('status')
         
         if not new_status:
@@ -180,15 +373,19 @@ class DocumentViewSet(viewsets.GenericViewSet):
                 'results': [],
                 'errors': {'status': 'Status is required'}
             }, status=status.HTTP_400_BAD_REQUEST)
-        
-        document.status = new_status
+
+        if new_status not in Document.STATUS_LABELS:
+            return Response({
+                'count': 0,
+                'next': None,
+                'previous': None,
+                'results': [],
+                'errors': {'status': f'Invalid status: {new_status}'}
+            }, status=status.HTTP_400_BAD_REQUEST)
         
         # If status is being changed to 'in_review', set the reviewer
-        if new_status == 'in_review' and not document.reviewed_by:
-            document.reviewed_by = request.user
-        
-        document.save()
-        serializer = self.get_serializer_class()(document)
+        document.set_status(new_status, request.user)
+        serializer = self.get_serializer(document)
         return Response({
             'count': 1,
             'next': None,
@@ -201,18 +398,11 @@ class DocumentViewSet(viewsets.GenericViewSet):
         return serializer_class(*args, **kwargs)
         
     def paginate_queryset(self, queryset):
-        """Initialize paginator and paginate queryset"""
-        if not hasattr(self, '_paginator'):
-            self._paginator = self.pagination_class()
-            
+        """Paginate queryset unless the client asked for ?no_page=true"""
         if self.request.query_params.get('no_page', '').lower() == 'true':
             return None
             
-        return self._paginator.paginate_queryset(queryset, self.request, view=self)
-        
-    def get_paginated_response(self, data):
-        assert hasattr(self, '_paginator')
-        return self._paginator.get_paginated_response(data)
+        return self.paginator.paginate_queryset(queryset, self.request, view=self)
 
 
 class DocumentAttachmentViewSet(viewsets.ViewSet):
@@ -220,14 +410,21 @@ class DocumentAttachmentViewSet(viewsets.ViewSet):
     API endpoint that allows document attachments to be managed.
     """
     permission_classes = [IsAuthenticated]
+    throttle_scope = 'attachment_upload'
     
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action == 'create':
+            throttles.append(ScopedRateThrottle())
+        return throttles
+
     def get_serializer_class(self):
         if self.action == 'create':
             return DocumentAttachmentCreateSerializer
         return DocumentAttachmentSerializer
     
     def get_queryset(self):
-        queryset = DocumentAttachment.objects.all()
+        queryset = DocumentAttachment.objects.order_by('-created_at')
         document_id = self.request.query_params.get('document_id')
         
         if document_id:
@@ -242,11 +439,20 @@ class DocumentAttachmentViewSet(viewsets.ViewSet):
     
     @csrf_exempt
     def create(self, request):
-        serializer = DocumentAttachmentCreateSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        # Reject instead of queueing when the worker is saturated with uploads
+        if not _upload_semaphore.acquire(blocking=False):
+            return Response(
+                {'detail': 'Too many uploads in progress, please retry shortly.'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+        try:
+            serializer = DocumentAttachmentCreateSerializer(data=request.data)
+            if serializer.is_valid():
+                serializer.save()
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            _upload_semaphore.release()
     
     def retrieve(self, request, pk=None):
         queryset = self.get_queryset()
@@ -295,7 +501,7 @@ class SignatureViewSet(viewsets.ViewSet):
         return SignatureSerializer
     
     def get_queryset(self):
-        queryset = Signature.objects.all()
+        queryset = Signature.objects.select_related('signed_by').order_by('-signed_at')
         attachment_id = self.request.query_params.get('attachment_id')
         
         if attachment_id:
@@ -305,98 +511,59 @@ class SignatureViewSet(viewsets.ViewSet):
     
     def list(self, request):
         queryset = self.get_queryset()
-        serializer = self.get_serializer_class()(queryset, many=True)
+        serializer = self.get_serializer_class()(
+            queryset, many=True, context={'user_representations': {}}
+        )
         return Response(serializer.data)
     
     def create(self, request):
         import os
-        import shutil
-        from datetime import datetime
-        from pathlib import Path
-        from django.core.files import File
-
-        data = request.data
-        user_comments = data.pop("comments")
-        serializer = SignatureCreateSerializer(data=data)
+
+        # Read comments without popping them off request.data: the serializer
+        # ignores the extra key, and multipart QueryDicts are immutable
+        user_comments = request.data.get("comments")
+        serializer = SignatureCreateSerializer(data=request.data)
         if serializer.is_valid():
-            attachment_id = serializer.validated_data.get('attachment')
-
-            # Check if there are existing signatures for this attachment
-            existing_signatures = Signature.objects.filter(attachment=attachment_id)
-
-            if existing_signatures.exists():
-                # VERSION REPLACEMENT LOGIC
-                # 1. Get the attachment
-                attachment = attachment_id
-
-                # 2. If original_file doesn't exist, back up the current file first
-                if not attachment.original_file:
-                    # This is the first signature - back up the original
-                    original_file_path = attachment.file.path
-                    if os.path.exists(original_file_path):
-                        # Copy the original file to original_file field with timestamp filename
-                        with open(original_file_path, 'rb') as f:
-                            file_extension = Path(attachment.file.name).suffix.lower()
-                            timestamp = int(datetime.now().timestamp())
-                            file_name = f"{timestamp}{file_extension}"
-                            attachment.original_file.save(file_name, File(f), save=False)
-
-                # 3. Restore the original file to the main file field
-                if attachment.original_file:
-                    original_path = attachment.original_file.path
-                    current_path = attachment.file.path
-
-                    if os.path.exists(original_path):
-                        # Copy original back to current
-                        shutil.copy2(original_path, current_path)
-
-                # 4. Delete all existing signatures for this attachment
-                existing_signatures.delete()
-
-                # 5. Increment version number
-                attachment.version_number += 1
-                attachment.save()
-            else:
-                # FIRST SIGNATURE LOGIC
-                # Back up the original file before first signature
-                attachment = attachment_id
-                if not attachment.original_file:
-                    original_file_path = attachment.file.path
-                    if os.path.exists(original_file_path):
-                        with open(original_file_path, 'rb') as f:
-                            file_extension = Path(attachment.file.name).suffix.lower()
-                            timestamp = int(datetime.now().timestamp())
-                            file_name = f"{timestamp}{file_extension}"
-                            attachment.original_file.save(file_name, File(f), save=False)
-                        attachment.save()
-
-            # Create the new signature
-            signature_obj = serializer.save(signed_by=request.user)
-            signature_obj.attachment.document.comments = user_comments
-            signature_obj.attachment.document.save()
-
-            # For image documents, increment version for ALL image attachments that will be processed
-            document = signature_obj.attachment.document
-            file_extension = os.path.splitext(signature_obj.attachment.file.name)[1].lower()
-            if file_extension in ['.png', '.jpg', '.jpeg']:
-                # This is an image document - all image attachments will be signed
-                # Check if this is a re-signature by checking the main attachment
-                main_attachment_version = signature_obj.attachment.version_number
-
-                # If main attachment version > 1, this is a re-signature for all images
-                if main_attachment_version > 1:
-                    all_image_attachments = document.attachments.filter(
-                        file__iregex=r'\.(png|jpg|jpeg)$'
-                    ).exclude(id=signature_obj.attachment.id)
-
-                    for attachment in all_image_attachments:
-                        # Increment version for all other image attachments
-                        attachment.version_number += 1
-                        attachment.save()
-
-            # Process the document with the new signature
-            sign_doc = SignatureAgent(signature_obj)
-            sign_doc.process_document()
+            attachment = serializer.validated_data.get('attachment')
+
+            with transaction.atomic():
+                # Check if there are existing signatures for this attachment
+                existing_signatures = Signature.objects.filter(attachment=attachment)
+
+                # VERSION REPLACEMENT LOGIC: a re-signature starts over from the
+                # original file, so drop the old signatures and bump the version
+                is_resignature = existing_signatures.exists()
+                if is_resignature:
+                    existing_signatures.delete()
+                    attachment.version_number += 1
+                    attachment.save(update_fields=['version_number'])
+
+                # Create the new signature
+                signature_obj = serializer.save(signed_by=request.user)
+                signature_obj.attachment.document.comments = user_comments
+                signature_obj.attachment.document.save(update_fields=['comments', 'updated_at'])
+
+                # For image documents, increment version for ALL image attachments that will be processed
+                document = signature_obj.attachment.document
+                file_extension = os.path.splitext(signature_obj.attachment.file.name)[1].lower()
+                if file_extension in IMAGE_EXTENSIONS:
+                    # This is an image document - all image attachments will be signed
+                    # Check if this is a re-signature by checking the main attachment
+                    main_attachment_version = signature_obj.attachment.version_number
+
+                    # If main attachment version > 1, this is a re-signature for all images
+                    if main_attachment_version > 1:
+                        # Increment version for all other image attachments in one UPDATE
+                        document.attachments.filter(IMAGE_FILE_FILTER).exclude(id=signature_obj.attachment.id).update(
+                            version_number=F('version_number') + 1
+                        )
+
+                # Back up/restore the file and stamp the signature only once the
+                # rows above are committed, so a failed request leaves no half-signed
+                # state; with SIGNATURE_WORKERS set this runs off the request thread
+                transaction.on_commit(
+                    lambda sid=signature_obj.id, restore=is_resignature: enqueue_signature(sid, restore)
+                )
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
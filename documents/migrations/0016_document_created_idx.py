@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0015_signature_department_data'),
+        ('lookups', '0003_defaultsignature'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-created_at', '-id'], name='doc_created_idx'),
+        ),
+    ]
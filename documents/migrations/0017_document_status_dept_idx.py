@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0016_document_created_idx'),
+        ('lookups', '0003_defaultsignature'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'department', '-created_at'], name='doc_status_dept_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:42
+
+import django.db.models.manager
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0017_document_status_dept_idx'),
+        ('lookups', '0003_defaultsignature'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='document',
+            options={'default_manager_name': 'all_objects', 'ordering': ['-created_at'], 'verbose_name': 'Document', 'verbose_name_plural': 'Documents'},
+        ),
+        migrations.AlterModelManagers(
+            name='document',
+            managers=[
+                ('all_objects', django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='document',
+            name='doc_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-created_at', '-id'], name='doc_active_idx'),
+        ),
+    ]
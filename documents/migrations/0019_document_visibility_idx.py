@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0018_document_active_manager'),
+        ('lookups', '0003_defaultsignature'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['uploaded_by', '-created_at'], name='doc_uploader_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['reviewed_by', '-created_at'], name='doc_reviewer_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0019_document_visibility_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='signature',
+            index=models.Index(fields=['attachment', '-signed_at'], name='sig_attachment_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0020_signature_attachment_idx'),
+        ('lookups', '0003_defaultsignature'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['priority', '-created_at'], name='doc_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['department', '-created_at'], name='doc_department_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentattachment',
+            index=models.Index(fields=['document', '-created_at'], name='att_document_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='signature',
+            index=models.Index(fields=['signed_by', '-signed_at'], name='sig_signed_by_idx'),
+        ),
+    ]
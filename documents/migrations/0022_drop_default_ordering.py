@@ -0,0 +1,25 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0021_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='document',
+            options={'default_manager_name': 'all_objects', 'verbose_name': 'Document', 'verbose_name_plural': 'Documents'},
+        ),
+        migrations.AlterModelOptions(
+            name='documentattachment',
+            options={'verbose_name': 'Document Attachment', 'verbose_name_plural': 'Document Attachments'},
+        ),
+        migrations.AlterModelOptions(
+            name='signature',
+            options={'verbose_name': 'Signature', 'verbose_name_plural': 'Signatures'},
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.6 on 2026-10-15 22:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+VALID_STATUSES = ['pending', 'in_review', 'signed']
+VALID_FILE_TYPES = ['pdf', 'images']
+
+
+def check_invalid_choices(apps, schema_editor):
+    """
+    Refuse to add the constraints while rows hold values outside the choices.
+
+    Older code accepted any status string, and there is no safe default to
+    rewrite such rows to: 'pending' documents are visible to every helpdesk
+    user, and an image document is not a PDF. The offending ids are listed so
+    they can be corrected by hand before migrating again.
+    """
+    Document = apps.get_model('documents', 'Document')
+    problems = []
+    for field, valid in (('status', VALID_STATUSES), ('file_type', VALID_FILE_TYPES)):
+        invalid = list(
+            Document.all_objects.exclude(**{field + '__in': valid})
+            .order_by('pk').values_list('pk', field)
+        )
+        if invalid:
+            problems.append('%s not in %s: %s' % (
+                field, valid, ', '.join('%s=%r' % row for row in invalid),
+            ))
+    if problems:
+        raise ValueError(
+            'Cannot add document check constraints; fix these documents first. '
+            + '; '.join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0022_drop_default_ordering'),
+        ('lookups', '0003_defaultsignature'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_invalid_choices, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='document',
+            constraint=models.CheckConstraint(check=models.Q(('status__in', VALID_STATUSES)), name='doc_status_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='document',
+            constraint=models.CheckConstraint(check=models.Q(('file_type__in', VALID_FILE_TYPES)), name='doc_file_type_valid'),
+        ),
+    ]
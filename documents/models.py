@@ -1,3 +1,6 @@
+import time
+
+from django.core.cache import cache
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -5,6 +8,43 @@ from lookups.models import Department, Priority
 
 User = get_user_model()
 
+
+class DocumentQuerySet(models.QuerySet):
+    def for_list(self):
+        """
+        Load only the columns ListDocumentSerializer reads.
+
+        Leaves comments, redirect_department and the other unused columns unread.
+        """
+        return self.only('id', 'title', 'description', 'priority', 'status', 'created_at')
+
+    def with_relations(self):
+        """Eager-load the users and attachments rendered by DocumentSerializer."""
+        return self.select_related('uploaded_by', 'reviewed_by').prefetch_related(
+            models.Prefetch('attachments', queryset=DocumentAttachment.objects.order_by('-created_at'))
+        )
+
+
+class ActiveDocumentManager(models.Manager.from_queryset(DocumentQuerySet)):
+    """Hide soft-deleted documents from every query built on this manager."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
+# Module level so Document.Meta can build its check constraints from them
+DOCUMENT_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('in_review', 'In Review'),
+    ('signed', 'Signed'),
+]
+
+DOCUMENT_FILE_TYPE_CHOICES = [
+    ('pdf', 'PDF Document'),
+    ('images', 'Image Files'),
+]
+
+
 class Document(models.Model):
     PRIORITY_CHOICES = [
         ('high', 'High'),
@@ -12,16 +52,10 @@ class Document(models.Model):
         ('low', 'Low'),
     ]
 
-    STATUS_CHOICES = [
-        ('pending', 'Pending'),
-        ('in_review', 'In Review'),
-        ('signed', 'Signed'),
-    ]
+    STATUS_CHOICES = DOCUMENT_STATUS_CHOICES
+    STATUS_LABELS = dict(STATUS_CHOICES)
 
-    FILE_TYPE_CHOICES = [
-        ('pdf', 'PDF Document'),
-        ('images', 'Image Files'),
-    ]
+    FILE_TYPE_CHOICES = DOCUMENT_FILE_TYPE_CHOICES
     
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
@@ -56,13 +90,93 @@ class Document(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    LIST_CACHE_VERSION_KEY = 'documents:list_version'
+
+    # Soft-deleted documents are excluded by default; the admin and related
+    # lookups go through all_objects so deleted rows stay reachable there
+    objects = ActiveDocumentManager()
+    all_objects = DocumentQuerySet.as_manager()
+
     class Meta:
-        ordering = ['-created_at']
         verbose_name = 'Document'
         verbose_name_plural = 'Documents'
+        default_manager_name = 'all_objects'
+        indexes = [
+            # Backs keyset pagination on (created_at, id) over active documents
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='doc_active_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+            # Filtered list pages; soft-deleted rows are never listed
+            models.Index(
+                fields=['status', 'department', '-created_at'],
+                name='doc_status_dept_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+            # Per-branch lookups of the non-CEO visibility UNION
+            models.Index(
+                fields=['uploaded_by', '-created_at'],
+                name='doc_uploader_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=['reviewed_by', '-created_at'],
+                name='doc_reviewer_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+            # Single-column filters of the document list
+            models.Index(
+                fields=['priority', '-created_at'],
+                name='doc_priority_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=['department', '-created_at'],
+                name='doc_department_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(status__in=[value for value, _ in DOCUMENT_STATUS_CHOICES]),
+                name='doc_status_valid',
+            ),
+            models.CheckConstraint(
+                check=models.Q(file_type__in=[value for value, _ in DOCUMENT_FILE_TYPE_CHOICES]),
+                name='doc_file_type_valid',
+            ),
+        ]
+
+    @classmethod
+    def list_cache_version(cls):
+        """
+        Token that changes whenever any document is saved or deleted.
+
+        Stored in the default cache, which is a per-process LocMemCache unless
+        CACHES configures a shared backend, so only the process that made the
+        write sees the new token.
+        """
+        return cache.get(cls.LIST_CACHE_VERSION_KEY, 0)
+
+    def set_status(self, status, user):
+        """Change the review status, assigning user as reviewer when review starts."""
+        self.status = status
+        if status == 'in_review' and not self.reviewed_by_id:
+            self.reviewed_by = user
+        self.save(update_fields=['status', 'reviewed_by', 'updated_at'])
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.set(self.LIST_CACHE_VERSION_KEY, time.time_ns(), None)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.set(self.LIST_CACHE_VERSION_KEY, time.time_ns(), None)
+        return result
 
     def __str__(self):
-        return f"{self.title} ({self.get_status_display()})"
+        return f"{self.title} ({self.STATUS_LABELS.get(self.status, self.status)})"
 
 
 class DocumentAttachment(models.Model):
@@ -87,9 +201,12 @@ class DocumentAttachment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ['-created_at']
         verbose_name = 'Document Attachment'
         verbose_name_plural = 'Document Attachments'
+        indexes = [
+            # Attachments of one document, newest first as the API lists them
+            models.Index(fields=['document', '-created_at'], name='att_document_idx'),
+        ]
 
     def __str__(self):
         return f"{self.original_name} ({self.document.title})"
@@ -114,9 +231,13 @@ class Signature(models.Model):
     signed_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        ordering = ['-signed_at']
         verbose_name = 'Signature'
         verbose_name_plural = 'Signatures'
+        indexes = [
+            # Signatures of one attachment, newest first as the API lists them
+            models.Index(fields=['attachment', '-signed_at'], name='sig_attachment_idx'),
+            models.Index(fields=['signed_by', '-signed_at'], name='sig_signed_by_idx'),
+        ]
 
     def __str__(self):
         return f"Signature by {self.signed_by.username} on {self.signed_at}"
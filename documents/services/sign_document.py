@@ -1,15 +1,138 @@
 import base64
+import hashlib
+import re
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from threading import Lock
+from typing import BinaryIO, Optional, Tuple, List, Dict
 
 from PIL import Image, ImageDraw, ImageFont
 from PyPDF2 import PdfReader, PdfWriter
-import arabic_reshaper
-from bidi.algorithm import get_display
+from PyPDF2.generic import (
+    ArrayObject, DecodedStreamObject, DictionaryObject, IndirectObject, NameObject, NumberObject, StreamObject,
+)
 from django.core.files.base import ContentFile
-from pdf2image import convert_from_bytes
+
+
+# Any character in the Arabic block marks text as RTL
+_ARABIC_RE = re.compile('[\u0600-\u06FF]')
+
+
+# Decoded payloads keyed by a digest of the base64 text, most recent last.
+# Only a handful are kept: the keys stay small and the images are the only
+# sizeable thing retained.
+_DECODED_IMAGE_CACHE: 'OrderedDict[bytes, Image.Image]' = OrderedDict()
+_DECODED_IMAGE_CACHE_SIZE = 4
+_decoded_image_cache_lock = Lock()
+
+
+def _decode_image_payload(base64_str: str) -> Image.Image:
+    """
+    Decode a base64 image payload into an RGBA image.
+
+    Cached because the same payloads come back on every signing (the default
+    signature, a user's saved signature). The returned image is shared between
+    callers and must be treated as read-only.
+    """
+    key = hashlib.blake2b(base64_str.encode('ascii')).digest()
+    with _decoded_image_cache_lock:
+        image = _DECODED_IMAGE_CACHE.get(key)
+        if image is not None:
+            _DECODED_IMAGE_CACHE.move_to_end(key)
+            return image
+
+    image = Image.open(BytesIO(base64.b64decode(base64_str)))
+
+    # Convert to RGBA for transparency support
+    if image.mode != 'RGBA':
+        image = image.convert('RGBA')
+    else:
+        image.load()
+
+    with _decoded_image_cache_lock:
+        _DECODED_IMAGE_CACHE[key] = image
+        if len(_DECODED_IMAGE_CACHE) > _DECODED_IMAGE_CACHE_SIZE:
+            _DECODED_IMAGE_CACHE.popitem(last=False)
+    return image
+
+
+def _find_arabic_font_paths() -> Tuple[str, ...]:
+    """List the installed fonts that support Arabic characters, in preference order."""
+    font_candidates = [
+        # Arabic-supporting fonts
+        "arial.ttf",
+        "Arial.ttf",
+        "tahoma.ttf",
+        "Tahoma.ttf",
+        "times.ttf",
+        "Times.ttf",
+        "DejaVuSans.ttf",
+        "LiberationSans-Regular.ttf",
+    ]
+    
+    # Common font paths
+    paths_to_try = []
+    
+    # Windows
+    if Path("C:/").exists():
+        paths_to_try.extend([
+            "C:/Windows/Fonts/",
+            "C:/WINNT/Fonts/",
+        ])
+    
+    # Linux/Mac
+    paths_to_try.extend([
+        "/usr/share/fonts/truetype/",
+        "/usr/share/fonts/TTF/",
+        "/Library/Fonts/",
+        "/System/Library/Fonts/",
+    ])
+    
+    return tuple(
+        str(font_path)
+        for base_path in paths_to_try
+        for font_path in (Path(base_path) / font_name for font_name in font_candidates)
+        if font_path.exists()
+    )
+
+
+# Resolved once per process; the font directories don't change while running
+_ARABIC_FONT_PATHS = _find_arabic_font_paths()
+
+
+@lru_cache(maxsize=16)
+def _load_arabic_font(font_size: int) -> ImageFont.FreeTypeFont:
+    """
+    Load the first usable Arabic font at the given size.
+
+    Cached because parsing the TTF tables is far more expensive than using the
+    font, and every signing asks for the same few sizes.
+    """
+    for font_path in _ARABIC_FONT_PATHS:
+        try:
+            return ImageFont.truetype(font_path, font_size)
+        except Exception:
+            continue
+    
+    # Fallback to default
+    try:
+        return ImageFont.truetype("arial.ttf", font_size)
+    except:
+        return ImageFont.load_default()
+
+
+def _add_pdf_object(writer: PdfWriter, obj) -> IndirectObject:
+    """
+    Register obj with writer and return an indirect reference to it.
+
+    PyPDF2 3.0.1 (pinned in requirements.txt) has no public API for this, so
+    the private PdfWriter._add_object is called here and nowhere else; check
+    it when upgrading PyPDF2.
+    """
+    return writer._add_object(obj)
 
 
 class SignatureAgent:
@@ -43,6 +166,17 @@ class SignatureAgent:
     COMMENTS_SCALE_FACTOR = 0.35
     DEPARTMENT_SCALE_FACTOR = 0.25
     
+    # Resolution the stamp is laid out and embedded at on PDF pages
+    PDF_RENDER_DPI = 150
+    
+    # Encoder settings for signed images, per output format. zlib level 3 is
+    # several times faster than the default 6 on scans at about the same size;
+    # JPEG keeps 4:2:0 but loses less than the default quality of 75.
+    IMAGE_SAVE_OPTIONS = {
+        'PNG': {'compress_level': 3},
+        'JPEG': {'quality': 85, 'subsampling': 2},
+    }
+    
     def __init__(self, signature_model):
         """
         Initialize the SignatureAgent with a Signature model instance.
@@ -91,80 +225,34 @@ class SignatureAgent:
         
         Returns:
             Absolute position in pixels
-        """
-        percentage = SignatureAgent._validate_percentage(percentage, 'percentage')
-        margin_percentage = SignatureAgent._validate_percentage(margin_percentage, 'margin_percentage')
         
+        Percentages are not re-validated here; the class constants passed in are
+        checked once when the module is imported.
+        """
         margin_pixels = int(document_dimension * margin_percentage)
         
+        position = document_dimension * percentage
+        # From the bottom/right edge the element ends at the percentage point,
+        # otherwise it starts there
         if from_bottom_or_right:
-            # Position from bottom/right edge
-            position_from_edge = document_dimension * percentage
-            position = position_from_edge - element_dimension
-            max_position = document_dimension - element_dimension - margin_pixels
-        else:
-            # Position from top/left edge
-            position = document_dimension * percentage
-            max_position = document_dimension - element_dimension - margin_pixels
-        
-        min_position = margin_pixels
-        return int(max(min_position, min(position, max_position)))
+            position -= element_dimension
+        max_position = document_dimension - element_dimension - margin_pixels
+        return int(max(margin_pixels, min(position, max_position)))
     
     @staticmethod
     def _get_arabic_font(font_size: int) -> ImageFont.FreeTypeFont:
         """Try to load a font that supports Arabic characters."""
-        font_candidates = [
-            # Arabic-supporting fonts
-            "arial.ttf",
-            "Arial.ttf",
-            "tahoma.ttf",
-            "Tahoma.ttf",
-            "times.ttf",
-            "Times.ttf",
-            "DejaVuSans.ttf",
-            "LiberationSans-Regular.ttf",
-        ]
-        
-        # Common font paths
-        paths_to_try = []
-        
-        # Windows
-        if Path("C:/").exists():
-            paths_to_try.extend([
-                "C:/Windows/Fonts/",
-                "C:/WINNT/Fonts/",
-            ])
-        
-        # Linux/Mac
-        paths_to_try.extend([
-            "/usr/share/fonts/truetype/",
-            "/usr/share/fonts/TTF/",
-            "/Library/Fonts/",
-            "/System/Library/Fonts/",
-        ])
-        
-        for base_path in paths_to_try:
-            for font_name in font_candidates:
-                font_path = Path(base_path) / font_name
-                if font_path.exists():
-                    try:
-                        return ImageFont.truetype(str(font_path), font_size)
-                    except Exception:
-                        continue
-        
-        # Fallback to default
-        try:
-            return ImageFont.truetype("arial.ttf", font_size)
-        except:
-            return ImageFont.load_default()
+        return _load_arabic_font(font_size)
     
     @staticmethod
-    def _format_text_for_display(text: str) -> str:
+    def _format_text_for_display(text: str, has_arabic: Optional[bool] = None) -> str:
         """
         Format text for proper display, handling Arabic RTL text correctly.
         
         Args:
             text: Input text that may contain Arabic
+            has_arabic: Whether text contains Arabic, if the caller already
+                knows; skips the scan
             
         Returns:
             Properly formatted text for display
@@ -173,10 +261,15 @@ class SignatureAgent:
             return ""
         
         # Check if text contains Arabic characters
-        has_arabic = any('\u0600' <= char <= '\u06FF' for char in text)
+        if has_arabic is None:
+            has_arabic = _ARABIC_RE.search(text) is not None
         
         if has_arabic:
             try:
+                # Imported on first Arabic text; most signings never need them
+                import arabic_reshaper
+                from bidi.algorithm import get_display
+                
                 # Reshape and apply bidirectional algorithm for Arabic
                 reshaped = arabic_reshaper.reshape(text)
                 formatted = get_display(reshaped)
@@ -191,28 +284,19 @@ class SignatureAgent:
     
     def _decode_base64_image(self, base64_data: str) -> Optional[Image.Image]:
         """Decode base64 string into PIL Image."""
-        if not base64_data or not base64_data.strip():
+        # isspace() instead of strip() so multi-MB payloads aren't copied just to test them
+        if not base64_data or base64_data.isspace():
             return None
         
         try:
             # Extract base64 string from data URL if present
-            if 'base64,' in base64_data:
-                base64_str = base64_data.split('base64,')[1]
-            else:
-                base64_str = base64_data
+            marker = base64_data.find('base64,')
+            base64_str = base64_data[marker + 7:] if marker >= 0 else base64_data
             
-            if not base64_str.strip():
+            if not base64_str or base64_str.isspace():
                 return None
             
-            # Decode base64
-            image_data = base64.b64decode(base64_str)
-            image = Image.open(BytesIO(image_data))
-            
-            # Convert to RGBA for transparency support
-            if image.mode != 'RGBA':
-                image = image.convert('RGBA')
-            
-            return image
+            return _decode_image_payload(base64_str)
             
         except Exception as e:
             raise ValueError(f"Failed to decode base64 image: {str(e)}")
@@ -275,20 +359,31 @@ class SignatureAgent:
         if not departments:
             return None
         
-        font = self._get_arabic_font(self.DEPARTMENT_FONT_SIZE)
+        return self._draw_department_list(tuple(departments), max_width_px)
+    
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _draw_department_list(cls, departments: Tuple[str, ...], max_width_px: int) -> Optional[Image.Image]:
+        """
+        Lay out and draw the bulleted department list.
         
-        # Temporary image for text measurement
-        temp_img = Image.new('RGBA', (10, 10), (0, 0, 0, 0))
-        temp_draw = ImageDraw.Draw(temp_img)
+        Cached because the same lists come back on every page of a PDF and on
+        repeated signings. The returned image is shared between callers and must
+        be treated as read-only.
+        """
+        font = cls._get_arabic_font(cls.DEPARTMENT_FONT_SIZE)
         
-        # Measure bullet size
-        bullet_w, bullet_h = temp_draw.textbbox((0, 0), self.DEPARTMENT_BULLET, font=font)[2:4]
+        # Measure bullet size; the font measures text itself, no scratch image needed
+        bullet_w, bullet_h = font.getbbox(cls.DEPARTMENT_BULLET)[2:4]
         bullet_gap = 8
         bullet_area = bullet_w + bullet_gap
         
+        # Memoized per render: every line that fits was already measured as a
+        # wrap candidate, so the layout and draw passes below reuse that result
+        @lru_cache(maxsize=None)
         def measure_text(text: str) -> Tuple[int, int]:
             """Measure text dimensions."""
-            bbox = temp_draw.textbbox((0, 0), text, font=font)
+            bbox = font.getbbox(text)
             return bbox[2] - bbox[0], bbox[3] - bbox[1]
         
         # Process and wrap department names
@@ -301,13 +396,13 @@ class SignatureAgent:
                 continue
             
             # Check if text contains Arabic
-            is_arabic = any('\u0600' <= ch <= '\u06FF' for ch in dept)
+            is_arabic = _ARABIC_RE.search(dept) is not None
             
             # Format text for display
-            display_text = self._format_text_for_display(dept) if is_arabic else dept
+            display_text = cls._format_text_for_display(dept, has_arabic=True) if is_arabic else dept
             
             # Maximum text width (accounting for bullet)
-            text_max_width = max_width_px - (self.DEPARTMENT_PADDING * 2)
+            text_max_width = max_width_px - (cls.DEPARTMENT_PADDING * 2)
             if is_arabic:
                 text_max_width -= bullet_area  # Reserve space for bullet on right
             
@@ -344,43 +439,52 @@ class SignatureAgent:
             line_heights.append(h)
         
         max_line_width = max(line_widths)
-        total_height = sum(line_heights) + (self.DEPARTMENT_LINE_SPACING * (len(lines_to_render) - 1))
+        total_height = sum(line_heights) + (cls.DEPARTMENT_LINE_SPACING * (len(lines_to_render) - 1))
         
         # Create final image
-        img_width = min(max_width_px, max_line_width + bullet_area + (self.DEPARTMENT_PADDING * 2))
-        img_height = total_height + (self.DEPARTMENT_PADDING * 2)
+        img_width = min(max_width_px, max_line_width + bullet_area + (cls.DEPARTMENT_PADDING * 2))
+        img_height = total_height + (cls.DEPARTMENT_PADDING * 2)
         
         result_img = Image.new('RGBA', (img_width, img_height), (0, 0, 0, 0))
         draw = ImageDraw.Draw(result_img)
         
         # Draw each line
-        y = self.DEPARTMENT_PADDING
+        y = cls.DEPARTMENT_PADDING
         
         for i, (text, is_arabic, is_first) in enumerate(lines_to_render):
             line_w, line_h = measure_text(text)
             
             if is_arabic:
                 # Arabic/RTL: bullet on right, text right-aligned
-                bullet_x = img_width - self.DEPARTMENT_PADDING - bullet_w
+                bullet_x = img_width - cls.DEPARTMENT_PADDING - bullet_w
                 if is_first:  # Only draw bullet on first line of department
-                    draw.text((bullet_x, y), self.DEPARTMENT_BULLET, font=font, fill=self.DEPARTMENT_COLOR)
+                    draw.text((bullet_x, y), cls.DEPARTMENT_BULLET, font=font, fill=cls.DEPARTMENT_COLOR)
                 
-                text_x = img_width - self.DEPARTMENT_PADDING - bullet_area - line_w
-                draw.text((text_x, y), text, font=font, fill=self.DEPARTMENT_COLOR)
+                text_x = img_width - cls.DEPARTMENT_PADDING - bullet_area - line_w
+                draw.text((text_x, y), text, font=font, fill=cls.DEPARTMENT_COLOR)
             else:
                 # LTR: bullet on left
                 if is_first:  # Only draw bullet on first line of department
-                    draw.text((self.DEPARTMENT_PADDING, y), self.DEPARTMENT_BULLET, font=font, fill=self.DEPARTMENT_COLOR)
+                    draw.text((cls.DEPARTMENT_PADDING, y), cls.DEPARTMENT_BULLET, font=font, fill=cls.DEPARTMENT_COLOR)
                 
-                text_x = self.DEPARTMENT_PADDING + bullet_area
-                draw.text((text_x, y), text, font=font, fill=self.DEPARTMENT_COLOR)
+                text_x = cls.DEPARTMENT_PADDING + bullet_area
+                draw.text((text_x, y), text, font=font, fill=cls.DEPARTMENT_COLOR)
             
-            y += line_h + self.DEPARTMENT_LINE_SPACING
+            y += line_h + cls.DEPARTMENT_LINE_SPACING
         
         return result_img
     
     # ==================== IMAGE RESIZING ====================
     
+    @staticmethod
+    def _scaled_width(image: Optional[Image.Image], target_width: int) -> int:
+        """Width _resize_to_width would give image (0 when there is no image)."""
+        if not image:
+            return 0
+        if target_width <= 0 or image.width <= target_width:
+            return image.width
+        return target_width
+    
     @staticmethod
     def _resize_to_width(image: Image.Image, target_width: int, maintain_aspect: bool = True) -> Image.Image:
         """Resize image to target width while maintaining aspect ratio."""
@@ -396,244 +500,258 @@ class SignatureAgent:
         else:
             target_height = image.height
         
-        return image.resize((target_width, target_height), Image.Resampling.LANCZOS)
+        # reducing_gap first box-reduces by an integer factor, then runs LANCZOS on
+        # the smaller image. Image.resize ignores it for RGBA, so premultiply here.
+        size = (target_width, target_height)
+        if image.mode == 'RGBA':
+            resized = image.convert('RGBa').resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            return resized.convert('RGBA')
+        return image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
     
     # ==================== POSITION CALCULATION ====================
     
-    def _calculate_signature_position(self, page_width: int, page_height: int) -> Optional[Tuple[int, int]]:
-        """Calculate signature position in bottom-right corner."""
-        if not self.signature_image:
-            return None
-        
-        # Calculate position from bottom-right with margin
-        sig_width = self.signature_image.width
-        sig_height = self.signature_image.height
-        
+    def _calculate_stamp_position(
+        self, page_width: int, page_height: int, stamp_width: int, stamp_height: int
+    ) -> Tuple[int, int]:
+        """Calculate the top-left position of the stamp row in the bottom-right corner."""
         x = self._calculate_position_from_edge(
-            page_width, sig_width, self.SIGNATURE_HORIZONTAL_POSITION,
+            page_width, stamp_width, self.SIGNATURE_HORIZONTAL_POSITION,
             self.ELEMENTS_MIN_MARGIN, from_bottom_or_right=True
         )
-        
         y = self._calculate_position_from_edge(
-            page_height, sig_height, self.SIGNATURE_VERTICAL_POSITION,
+            page_height, stamp_height, self.SIGNATURE_VERTICAL_POSITION,
             self.ELEMENTS_MIN_MARGIN, from_bottom_or_right=True
         )
-        
-        return x, y
-    
-    def _calculate_elements_position(
-        self, 
-        page_width: int, 
-        page_height: int,
-        combined_width: int,
-        combined_height: int,
-        signature_y: int
-    ) -> Tuple[int, int]:
-        """
-        Calculate position for combined department list + comments block.
-        Places block above signature, right-aligned.
-        """
-        # Position from right edge, aligned with signature
-        x = self._calculate_position_from_edge(
-            page_width, combined_width, self.SIGNATURE_HORIZONTAL_POSITION,
-            self.ELEMENTS_MIN_MARGIN, from_bottom_or_right=True
-        )
-        
-        # Position above signature with small gap
-        gap = 10  # Small gap between block and signature
-        y = signature_y - combined_height - gap
-        
-        # Ensure block doesn't go above top margin
-        min_y = int(page_height * self.ELEMENTS_MIN_MARGIN)
-        y = max(min_y, y)
-        
         return x, y
     
     # ==================== DOCUMENT PROCESSING ====================
     
-    def _process_page_image(self, page_img: Image.Image) -> Image.Image:
-        """Add signature and elements to a single page image."""
-        # Create working copy
-        result_img = page_img.copy()
-        if result_img.mode != 'RGBA':
-            result_img = result_img.convert('RGBA')
-        
-        page_width, page_height = result_img.size
-        
-        # Resize signature and comments images proportionally
-        if self.signature_image:
-            sig_target_width = int(page_width * self.SIGNATURE_SCALE_FACTOR)
-            self.signature_image = self._resize_to_width(self.signature_image, sig_target_width)
-        
-        if self.comments_image:
-            comments_target_width = int(page_width * self.COMMENTS_SCALE_FACTOR)
-            self.comments_image = self._resize_to_width(self.comments_image, comments_target_width)
+    def _build_stamp(self, page_width: int, page_height: int) -> Optional[Tuple[Image.Image, int, int]]:
+        """
+        Lay out signature, comments and department list for a page of the given size.
         
-        # Create department list image
+        Returns:
+            The combined RGBA row and its top-left position in page pixels,
+            or None if there is nothing to draw
+        """
+        # Department list: a supplied image is resized below, a rendered one is
+        # drawn at the width it may occupy
         dept_max_width = int(page_width * self.DEPARTMENT_SCALE_FACTOR)
         if self.department_image:
-            department_img = self._resize_to_width(self.department_image, dept_max_width)
+            department_img = self.department_image
         else:
             department_img = self._render_department_list(dept_max_width)
         
-        # Build a single row: comments -> department list -> signature (signature on far right)
-        row_img = None
+        # Work out each element's final width before resampling, so every image
+        # goes through LANCZOS once instead of once per scaling step
         gap = self.SIDE_BY_SIDE_GAP_PIXELS
-        
-        if department_img and self.comments_image:
-            # comments + department (+ signature if present)
-            total_width = self.comments_image.width + gap + department_img.width
-            if self.signature_image:
-                total_width += gap + self.signature_image.width
-            
+        widths = [
+            self._scaled_width(self.comments_image, int(page_width * self.COMMENTS_SCALE_FACTOR)),
+            self._scaled_width(department_img, dept_max_width),
+            self._scaled_width(self.signature_image, int(page_width * self.SIGNATURE_SCALE_FACTOR)),
+        ]
+        present_widths = [width for width in widths if width]
+        if len(present_widths) > 1:
             # Ensure combined width doesn't exceed limit
+            total_width = sum(present_widths) + gap * (len(present_widths) - 1)
             max_combined_width = int(page_width * self.SIDE_BY_SIDE_MAX_WIDTH_RATIO)
             if total_width > max_combined_width:
                 # Scale down proportionally
                 scale_factor = max_combined_width / total_width
-                department_img = self._resize_to_width(department_img, max(1, int(department_img.width * scale_factor)))
-                self.comments_image = self._resize_to_width(self.comments_image, max(1, int(self.comments_image.width * scale_factor)))
-                if self.signature_image:
-                    self.signature_image = self._resize_to_width(self.signature_image, max(1, int(self.signature_image.width * scale_factor)))
-
-                total_width = self.comments_image.width + gap + department_img.width
-                if self.signature_image:
-                    total_width += gap + self.signature_image.width
-            
-            # Create combined image
-            row_height = max(
-                department_img.height,
-                self.comments_image.height,
-                self.signature_image.height if self.signature_image else 0,
-            )
-            row_img = Image.new(
-                'RGBA', 
-                (total_width, row_height),
-                (0, 0, 0, 0)
-            )
-            
-            # Paste comments (left)
-            comments_y = (row_img.height - self.comments_image.height) // 2
-            row_img.paste(self.comments_image, (0, comments_y), self.comments_image)
-
-            # Paste department list (middle)
-            dept_y = (row_img.height - department_img.height) // 2
-            dept_x = self.comments_image.width + gap
-            row_img.paste(
-                department_img,
-                (dept_x, dept_y),
-                department_img,
-            )
-
-            # Paste signature (right of department list)
-            if self.signature_image:
-                sig_y = (row_img.height - self.signature_image.height) // 2
-                sig_x = dept_x + department_img.width + gap
-                row_img.paste(self.signature_image, (sig_x, sig_y), self.signature_image)
-        
-        elif department_img and self.signature_image:
-            # department -> signature
-            total_width = department_img.width + gap + self.signature_image.width
-
-            max_combined_width = int(page_width * self.SIDE_BY_SIDE_MAX_WIDTH_RATIO)
-            if total_width > max_combined_width:
-                scale_factor = max_combined_width / total_width
-                department_img = self._resize_to_width(department_img, max(1, int(department_img.width * scale_factor)))
-                self.signature_image = self._resize_to_width(self.signature_image, max(1, int(self.signature_image.width * scale_factor)))
-                total_width = department_img.width + gap + self.signature_image.width
-
-            row_height = max(department_img.height, self.signature_image.height)
-            row_img = Image.new('RGBA', (total_width, row_height), (0, 0, 0, 0))
-
-            dept_y = (row_img.height - department_img.height) // 2
-            row_img.paste(department_img, (0, dept_y), department_img)
-
-            sig_y = (row_img.height - self.signature_image.height) // 2
-            row_img.paste(self.signature_image, (department_img.width + gap, sig_y), self.signature_image)
-
-        elif self.comments_image and self.signature_image:
-            # comments -> signature
-            total_width = self.comments_image.width + gap + self.signature_image.width
-
-            max_combined_width = int(page_width * self.SIDE_BY_SIDE_MAX_WIDTH_RATIO)
-            if total_width > max_combined_width:
-                scale_factor = max_combined_width / total_width
-                self.comments_image = self._resize_to_width(self.comments_image, max(1, int(self.comments_image.width * scale_factor)))
-                self.signature_image = self._resize_to_width(self.signature_image, max(1, int(self.signature_image.width * scale_factor)))
-                total_width = self.comments_image.width + gap + self.signature_image.width
-
-            row_height = max(self.comments_image.height, self.signature_image.height)
+                widths = [max(1, int(width * scale_factor)) if width else 0 for width in widths]
+        
+        comments_width, dept_width, sig_width = widths
+        if self.comments_image:
+            self.comments_image = self._resize_to_width(self.comments_image, comments_width)
+        if department_img:
+            department_img = self._resize_to_width(department_img, dept_width)
+        if self.signature_image:
+            self.signature_image = self._resize_to_width(self.signature_image, sig_width)
+        
+        # Build a single row: comments -> department list -> signature (signature on far right)
+        parts = [img for img in (self.comments_image, department_img, self.signature_image) if img]
+        row_img = None
+        
+        if len(parts) == 1:
+            row_img = parts[0]
+        elif parts:
+            total_width = sum(part.width for part in parts) + gap * (len(parts) - 1)
+            row_height = max(part.height for part in parts)
             row_img = Image.new('RGBA', (total_width, row_height), (0, 0, 0, 0))
-
-            comments_y = (row_img.height - self.comments_image.height) // 2
-            row_img.paste(self.comments_image, (0, comments_y), self.comments_image)
-
-            sig_y = (row_img.height - self.signature_image.height) // 2
-            row_img.paste(self.signature_image, (self.comments_image.width + gap, sig_y), self.signature_image)
-
-        elif department_img:
-            row_img = department_img
-        elif self.comments_image:
-            row_img = self.comments_image
-        elif self.signature_image:
-            row_img = self.signature_image
-        
-        # Stamp the final row bottom-right (with margins)
-        if row_img:
-            block_x = self._calculate_position_from_edge(
-                page_width,
-                row_img.width,
-                self.SIGNATURE_HORIZONTAL_POSITION,
-                self.ELEMENTS_MIN_MARGIN,
-                from_bottom_or_right=True,
-            )
-            block_y = self._calculate_position_from_edge(
-                page_height,
-                row_img.height,
-                self.SIGNATURE_VERTICAL_POSITION,
-                self.ELEMENTS_MIN_MARGIN,
-                from_bottom_or_right=True,
-            )
+            
+            # Copy left to right, each part vertically centred in the row. The parts
+            # don't overlap and the canvas is transparent, so a plain paste is exact;
+            # using the part as its own mask would square its alpha at the edges.
+            x = 0
+            for part in parts:
+                row_img.paste(part, (x, (row_height - part.height) // 2))
+                x += part.width + gap
+        
+        if not row_img:
+            return None
+        
+        # Place the final row bottom-right (with margins)
+        block_x, block_y = self._calculate_stamp_position(page_width, page_height, row_img.width, row_img.height)
+        return row_img, block_x, block_y
+    
+    def _process_page_image(self, page_img: Image.Image) -> Image.Image:
+        """
+        Add signature and elements to a single page image.
+        
+        RGB and RGBA pages are drawn on in place (callers pass a freshly decoded
+        page they don't reuse); other modes are converted to RGBA first. Pasting
+        with the overlay's alpha as mask only touches the overlay's box, so an
+        RGB page never needs a full-page RGBA round trip.
+        """
+        if page_img.mode in ('RGB', 'RGBA'):
+            result_img = page_img
+        else:
+            result_img = page_img.convert('RGBA')
+        
+        stamp = self._build_stamp(*result_img.size)
+        if stamp:
+            row_img, block_x, block_y = stamp
             result_img.paste(row_img, (block_x, block_y), row_img)
         
         return result_img
     
-    def _process_pdf(self, pdf_bytes: bytes) -> bytes:
-        """Process PDF document."""
+    # ==================== PDF STAMPING ====================
+    
+    @staticmethod
+    def _pdf_image_xobject(writer: PdfWriter, image: Image.Image) -> IndirectObject:
+        """Add image to writer as a Flate-compressed image XObject, with its alpha as soft mask."""
+        if image.mode != 'RGBA':
+            image = image.convert('RGBA')
+        
+        def image_stream(mode_image: Image.Image, color_space: str) -> StreamObject:
+            raw = DecodedStreamObject()
+            raw.set_data(mode_image.tobytes())
+            # flate_encode only carries /Filter over, so describe the image afterwards
+            stream = raw.flate_encode()
+            stream.update({
+                NameObject('/Type'): NameObject('/XObject'),
+                NameObject('/Subtype'): NameObject('/Image'),
+                NameObject('/Width'): NumberObject(mode_image.width),
+                NameObject('/Height'): NumberObject(mode_image.height),
+                NameObject('/ColorSpace'): NameObject(color_space),
+                NameObject('/BitsPerComponent'): NumberObject(8),
+            })
+            return stream
+        
+        xobject = image_stream(image.convert('RGB'), '/DeviceRGB')
+        xobject[NameObject('/SMask')] = _add_pdf_object(writer, image_stream(image.getchannel('A'), '/DeviceGray'))
+        return _add_pdf_object(writer, xobject)
+    
+    @staticmethod
+    def _pdf_content_stream(data: bytes) -> StreamObject:
+        """Wrap raw content stream operators in a stream object."""
+        stream = DecodedStreamObject()
+        stream.set_data(data)
+        return stream
+    
+    @staticmethod
+    def _pdf_display_matrix(page) -> Tuple[float, float, Tuple[float, ...]]:
+        """
+        Describe how a PDF page is displayed.
+        
+        Returns:
+            Displayed width and height in points, and the matrix mapping displayed
+            coordinates (origin bottom-left, after /Rotate) to the page's user space
+        """
+        box = page.cropbox
+        left, bottom = float(box.left), float(box.bottom)
+        width, height = float(box.width), float(box.height)
+        rotation = page.rotation % 360
+        
+        if rotation == 90:
+            return height, width, (0, 1, -1, 0, left + width, bottom)
+        if rotation == 180:
+            return width, height, (-1, 0, 0, -1, left + width, bottom + height)
+        if rotation == 270:
+            return height, width, (0, -1, 1, 0, left, bottom + height)
+        return width, height, (1, 0, 0, 1, left, bottom)
+    
+    def _has_elements_to_draw(self) -> bool:
+        """Whether there is a signature, comments, or department list to stamp."""
+        return bool(
+            self.signature_image
+            or self.comments_image
+            or self.department_image
+            or self._get_department_list()
+        )
+    
+    def _process_pdf(self, pdf_file: BinaryIO) -> bytes:
+        """Process PDF document read from a seekable binary file."""
+        # Nothing to stamp: keep the original
+        if not self._has_elements_to_draw():
+            return pdf_file.read()
+        
         try:
-            # Read original PDF
-            reader = PdfReader(BytesIO(pdf_bytes))
+            # Read original PDF; PdfReader seeks in the file as it needs objects
+            reader = PdfReader(pdf_file)
             writer = PdfWriter()
             
+            # The stamp is drawn on top of the existing page content instead of
+            # rasterizing the page, so the original vectors and text are kept and
+            # the page content is never parsed. Pages share one image per layout.
+            scale = self.PDF_RENDER_DPI / 72
+            stamp_images = {}
+            save_state = _add_pdf_object(writer, self._pdf_content_stream(b'q\n'))
+            
             # Process each page
-            for page_num, page in enumerate(reader.pages):
-                # Convert page to image
-                page_images = convert_from_bytes(pdf_bytes, first_page=page_num+1, last_page=page_num+1, dpi=150)
-                if not page_images:
-                    writer.add_page(page)
-                    continue
-                
-                page_img = page_images[0]
+            for page in reader.pages:
+                page = writer.add_page(page)
+                display_width, display_height, matrix = self._pdf_display_matrix(page)
                 
-                # Process the page image
-                processed_img = self._process_page_image(page_img)
+                # Lay out in pixels at PDF_RENDER_DPI, as on a rendered page
+                page_size = (round(display_width * scale), round(display_height * scale))
+                if page_size not in stamp_images:
+                    stamp = self._build_stamp(*page_size)
+                    if stamp:
+                        row_img, block_x, block_y = stamp
+                        stamp = (self._pdf_image_xobject(writer, row_img), row_img.size, block_x, block_y)
+                    stamp_images[page_size] = stamp
                 
-                # Convert back to PDF page
-                from reportlab.pdfgen import canvas
-                from reportlab.lib.utils import ImageReader
+                stamp = stamp_images[page_size]
+                if not stamp:
+                    continue
+                image_ref, (row_width, row_height), block_x, block_y = stamp
                 
-                temp_pdf = BytesIO()
-                c = canvas.Canvas(temp_pdf, pagesize=page_img.size)
+                # Copy the resource dicts rather than edit them; they may be shared
+                resources = page.get('/Resources')
+                resources = DictionaryObject(resources.get_object()) if resources is not None else DictionaryObject()
+                xobjects = resources.get('/XObject')
+                xobjects = DictionaryObject(xobjects.get_object()) if xobjects is not None else DictionaryObject()
+                image_name = '/SignatureStamp'
+                while image_name in xobjects:
+                    image_name += '_'
+                xobjects[NameObject(image_name)] = image_ref
+                resources[NameObject('/XObject')] = xobjects
+                page[NameObject('/Resources')] = resources
                 
-                # Draw processed image
-                img_reader = ImageReader(processed_img)
-                c.drawImage(img_reader, 0, 0, width=page_img.width, height=page_img.height)
-                c.save()
+                # Displayed points, origin bottom-left
+                width, height = row_width / scale, row_height / scale
+                x = block_x / scale
+                y = display_height - block_y / scale - height
+                operations = 'Q\nq\n{} cm\n{:.4f} 0 0 {:.4f} {:.4f} {:.4f} cm\n{} Do\nQ\n'.format(
+                    ' '.join('{:.4f}'.format(value) for value in matrix), width, height, x, y, image_name,
+                )
                 
-                # Add processed page
-                temp_pdf.seek(0)
-                processed_reader = PdfReader(temp_pdf)
-                writer.add_page(processed_reader.pages[0])
+                # q ... Q around the original content keeps its graphics state from
+                # leaking into the stamp
+                contents = page.get('/Contents')
+                if contents is None:
+                    streams = []
+                elif isinstance(contents.get_object(), ArrayObject):
+                    streams = list(contents.get_object())
+                else:
+                    streams = [contents]
+                streams = [
+                    stream if isinstance(stream, IndirectObject) else _add_pdf_object(writer, stream)
+                    for stream in streams
+                ]
+                stamp_ops = _add_pdf_object(writer, self._pdf_content_stream(operations.encode('ascii')))
+                page[NameObject('/Contents')] = ArrayObject([save_state, *streams, stamp_ops])
             
             # Save to bytes
             output = BytesIO()
@@ -643,11 +761,15 @@ class SignatureAgent:
         except Exception as e:
             raise Exception(f"Failed to process PDF: {str(e)}")
     
-    def _process_image(self, image_bytes: bytes) -> bytes:
-        """Process image document."""
+    def _process_image(self, image_file: BinaryIO) -> bytes:
+        """Process image document read from a seekable binary file."""
+        # Nothing to stamp: keep the original bytes rather than re-encoding them
+        if not self._has_elements_to_draw():
+            return image_file.read()
+        
         try:
             # Open and process image
-            img = Image.open(BytesIO(image_bytes))
+            img = Image.open(image_file)
             
             # Preserve original format and EXIF
             original_format = img.format
@@ -673,6 +795,7 @@ class SignatureAgent:
             output = BytesIO()
             
             save_args = {'format': original_format or 'PNG'}
+            save_args.update(self.IMAGE_SAVE_OPTIONS.get(save_args['format'], {}))
             if exif and isinstance(exif, bytes) and original_format in ['JPEG', 'TIFF']:
                 save_args['exif'] = exif
             
@@ -701,36 +824,41 @@ class SignatureAgent:
         
         # Get the attachment
         attachment = self.signature_model.attachment
-        file_name = attachment.file.name.lower()
+        # Classify once by extension; it also names the signed file
+        file_ext = Path(attachment.file.name).suffix.lower()
         
         try:
-            # Read file content
-            with attachment.file.open('rb') as f:
-                file_content = f.read()
-            
-            # Process based on file type
-            if file_name.endswith('.pdf'):
-                processed_content = self._process_pdf(file_content)
-            elif any(file_name.endswith(ext) for ext in self.IMAGE_EXTENSIONS):
-                processed_content = self._process_image(file_content)
+            if file_ext == '.pdf':
+                process = self._process_pdf
+            elif file_ext in self.IMAGE_EXTENSIONS:
+                process = self._process_image
             else:
-                raise ValueError(f"Unsupported file format: {Path(file_name).suffix}")
+                raise ValueError(f"Unsupported file format: {file_ext}")
+            
+            # Read from the open file rather than holding a second copy of it in memory
+            with attachment.file.open('rb') as f:
+                processed_content = process(f)
             
             # Save processed file
             timestamp = int(datetime.now().timestamp())
-            file_ext = Path(file_name).suffix
             new_filename = f"signed_{timestamp}{file_ext}"
             
             file_like_obj = ContentFile(processed_content, name=new_filename)
             attachment.file = file_like_obj
             attachment.is_signed = True
-            attachment.save()
+            attachment.save(update_fields=['file', 'is_signed'])
             
             # Update document status
             self.document.status = 'signed'
-            self.document.save()
+            self.document.save(update_fields=['status', 'updated_at'])
             
             return True
             
         except Exception as e:
-            raise Exception(f"Failed to process document: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to process document: {str(e)}")
+
+
+# The position constants are fixed, so validate them once instead of per call
+for _name in ('SIGNATURE_HORIZONTAL_POSITION', 'SIGNATURE_VERTICAL_POSITION', 'ELEMENTS_MIN_MARGIN'):
+    SignatureAgent._validate_percentage(getattr(SignatureAgent, _name), _name)
+del _name
@@ -0,0 +1,132 @@
+import logging
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+from documents.models import Signature
+from documents.services.sign_document import SignatureAgent
+
+logger = logging.getLogger(__name__)
+
+_executor = (
+    ThreadPoolExecutor(max_workers=settings.SIGNATURE_WORKERS, thread_name_prefix='signature')
+    if settings.SIGNATURE_WORKERS > 0
+    else None
+)
+
+
+def process_signature(signature_id: int, restore_original: bool = False) -> bool:
+    """
+    Do the file work for a freshly created signature and stamp it onto the attachment.
+
+    Meant to run after the transaction that created the signature has committed
+    (see SignatureViewSet.create), so it only takes the signature id and reloads
+    everything it needs. Kept free of request state so it can be handed to a task
+    queue as-is.
+
+    Args:
+        signature_id: Primary key of the Signature to apply
+        restore_original: Copy the backed-up original over the current file first,
+            so a re-signature starts from the unsigned document
+
+    Returns:
+        True if successful, raises exception otherwise
+    """
+    signature_obj = Signature.objects.select_related('attachment__document').get(pk=signature_id)
+    attachment = signature_obj.attachment
+
+    # Back up the original file before it is signed for the first time
+    if not attachment.original_file:
+        original_file_path = attachment.file.path
+        if os.path.exists(original_file_path):
+            file_extension = Path(attachment.file.name).suffix.lower()
+            timestamp = int(datetime.now().timestamp())
+            file_name = f"{timestamp}{file_extension}"
+            _clone_into(attachment.original_file, file_name, original_file_path)
+            attachment.save(update_fields=['original_file'])
+
+    # Restore the original file to the main file field
+    if restore_original and attachment.original_file:
+        _sync_file(attachment.original_file.path, attachment.file.path)
+
+    return SignatureAgent(signature_obj).process_document()
+
+
+def _clone_into(field_file, file_name: str, source_path: str) -> None:
+    """
+    Point field_file at a new stored file with the same content as source_path.
+
+    The file is hard-linked when source and target share a filesystem, so no
+    bytes pass through Python; otherwise it falls back to a plain copy.
+    """
+    storage = field_file.storage
+    name = field_file.field.generate_filename(field_file.instance, file_name)
+    while True:
+        name = storage.get_available_name(name)
+        target_path = storage.path(name)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        try:
+            os.link(source_path, target_path)
+        except FileExistsError:
+            # Another writer took the name after get_available_name checked it;
+            # copy2 would overwrite their file, so pick the next free name
+            continue
+        except OSError:
+            # Cross-device or no hard link support
+            shutil.copy2(source_path, target_path)
+        break
+    field_file.name = name
+
+
+def _sync_file(source_path: str, target_path: str) -> bool:
+    """
+    Copy source_path over target_path unless target already holds the same content.
+
+    One stat per side decides: the same inode (a hard-linked backup) or the
+    same size and mtime (which copy2 preserves) means there is nothing to copy.
+
+    Returns:
+        True if bytes were copied
+    """
+    try:
+        source = os.stat(source_path)
+    except FileNotFoundError:
+        return False
+    try:
+        target = os.stat(target_path)
+    except FileNotFoundError:
+        pass
+    else:
+        if os.path.samestat(source, target) or (
+            target.st_size == source.st_size and target.st_mtime == source.st_mtime
+        ):
+            return False
+    shutil.copy2(source_path, target_path)
+    return True
+
+
+def _process_signature_in_background(signature_id: int, restore_original: bool) -> None:
+    try:
+        process_signature(signature_id, restore_original)
+    except Exception:
+        logger.exception("Failed to process signature %s", signature_id)
+    finally:
+        # Worker threads hold their own connection; don't leave it open between jobs
+        connection.close()
+
+
+def enqueue_signature(signature_id: int, restore_original: bool = False) -> None:
+    """
+    Run process_signature on the background pool, or inline when SIGNATURE_WORKERS is 0.
+
+    Inline runs propagate errors to the caller as before; background failures are logged.
+    """
+    if _executor is None:
+        process_signature(signature_id, restore_original)
+    else:
+        _executor.submit(_process_signature_in_background, signature_id, restore_original)
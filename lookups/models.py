@@ -1,5 +1,8 @@
+from django.core.cache import cache
 from django.db import models
 
+_MISSING = object()
+
 class Department(models.Model):
     name_ar = models.CharField(max_length=100)
     name_en = models.CharField(max_length=100)
@@ -22,10 +25,32 @@ class Priority(models.Model):
 
 
 class DefaultSignature(models.Model):
+    DEFAULT_ID = 1
+    CACHE_KEY = 'lookups:default_signature_data'
+    CACHE_TIMEOUT = 60 * 60
+
     signature_data = models.TextField(blank=True, null=True, help_text='Base64 encoded signature')
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def get_default_signature_data(cls):
+        """Return the default signature's base64 data, cached to skip the DB round trip."""
+        data = cache.get(cls.CACHE_KEY, _MISSING)
+        if data is _MISSING:
+            data = cls.objects.only('signature_data').get(id=cls.DEFAULT_ID).signature_data
+            cache.set(cls.CACHE_KEY, data, cls.CACHE_TIMEOUT)
+        return data
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        cache.delete(self.CACHE_KEY)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        cache.delete(self.CACHE_KEY)
+        return result
+
     def __str__(self):
         return self.signature_data
\ No newline at end of file
@@ -237,7 +237,7 @@ class ChangePasswordView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         user.set_password(new_password)
-        user.save()
+        user.save(update_fields=['password'])
 
         # Delete existing tokens to force re-login
         Token.objects.filter(user=user).delete()